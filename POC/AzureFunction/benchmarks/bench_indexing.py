@@ -0,0 +1,113 @@
+"""Compare Cosmos DB RU cost per launch under different indexing policies.
+
+Runs the broker's queue -> claim -> delete cycle against two temporary
+containers, one with the default (index everything) policy and one with
+indexing.CLAIM_INDEXING_POLICY, and reports the average RU charge per
+operation from the x-ms-request-charge response headers (collected with a
+response_hook per call, every query page included). The Cosmos calls use the
+same arguments as function_app.py.
+
+Point it at the Cosmos DB emulator (or a scratch account), from POC/AzureFunction:
+
+    export COSMOS_ENDPOINT=https://localhost:8081/
+    export COSMOS_KEY=<emulator key>
+    python benchmarks/bench_indexing.py [launches] [--out results.jsonl]
+
+With --out, one JSON line per policy is appended so cost per launch can be
+tracked across runs.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from azure.cosmos import CosmosClient, PartitionKey  # noqa: E402
+
+from indexing import CLAIM_INDEXING_POLICY, DEFAULT_TTL_SECONDS, PARTITION_KEY_PATH, RequestCharge  # noqa: E402
+from models import ConnectionRequest  # noqa: E402
+
+POLICIES = {
+    "default": None,
+    "claim": CLAIM_INDEXING_POLICY,
+}
+
+QUERY = "SELECT * FROM c WHERE c.userId = @userId AND c.status = 'PENDING'"
+
+
+def sample_request(i: int) -> ConnectionRequest:
+    return ConnectionRequest(
+        user_id=f"bench-user-{i}@example.com",
+        target_ip="10.0.0.4",
+        username="admin",
+        password="S3cr3t-P@ssw0rd",
+        appstream_session_context="x" * 512,
+    )
+
+
+def run_policy(database, name: str, policy, launches: int) -> dict:
+    kwargs = {"indexing_policy": policy} if policy else {}
+    container = database.create_container(
+        id=f"bench-{name}-{uuid.uuid4().hex[:8]}",
+        partition_key=PartitionKey(path=PARTITION_KEY_PATH),
+        default_ttl=DEFAULT_TTL_SECONDS,
+        **kwargs,
+    )
+    totals = {"create": 0.0, "query": 0.0, "delete": 0.0}
+    try:
+        for i in range(launches):
+            item = sample_request(i).to_item()
+            charges = {op: RequestCharge() for op in totals}
+
+            container.create_item(body=item, response_hook=charges["create"])
+            list(
+                container.query_items(
+                    query=QUERY,
+                    parameters=[{"name": "@userId", "value": item["userId"]}],
+                    enable_cross_partition_query=False,
+                    response_hook=charges["query"],
+                )
+            )
+            container.delete_item(item=item["id"], partition_key=item["userId"], response_hook=charges["delete"])
+
+            for op, charge in charges.items():
+                totals[op] += charge.total
+    finally:
+        database.delete_container(container)
+
+    result = {op: round(total / launches, 2) for op, total in totals.items()}
+    result["launch"] = round(sum(result.values()), 2)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("launches", nargs="?", type=int, default=50)
+    parser.add_argument("--database", default=os.environ.get("COSMOS_DATABASE", "S1C_Bench"))
+    parser.add_argument("--out", help="Append results as JSON lines to this file")
+    args = parser.parse_args()
+
+    endpoint = os.environ.get("COSMOS_ENDPOINT")
+    key = os.environ.get("COSMOS_KEY")
+    if not endpoint or not key:
+        sys.exit("Set COSMOS_ENDPOINT and COSMOS_KEY (emulator or scratch account).")
+
+    client = CosmosClient(endpoint, key)
+    database = client.create_database_if_not_exists(args.database)
+    timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+    print(f"{'policy':>8} {'create':>8} {'query':>8} {'delete':>8} {'launch':>8}  (avg RU, {args.launches} launches)")
+    for name, policy in POLICIES.items():
+        result = run_policy(database, name, policy, args.launches)
+        print(f"{name:>8} {result['create']:>8} {result['query']:>8} {result['delete']:>8} {result['launch']:>8}")
+        if args.out:
+            with open(args.out, "a") as f:
+                f.write(json.dumps({"timestamp": timestamp, "policy": name, "launches": args.launches, **result}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Microbenchmark for the broker parse -> validate -> serialize path.
+
+Run from POC/AzureFunction:
+
+    python benchmarks/bench_models.py [iterations] [--no-orjson]
+
+Compares the typed models against the old get_json()/.get()/json.dumps path.
+Uses orjson when installed, otherwise the stdlib fallback; --no-orjson forces
+the fallback so it can be measured and checked even where orjson is present.
+"""
+
+import json
+import os
+import sys
+import timeit
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if "--no-orjson" in sys.argv:
+    sys.argv.remove("--no-orjson")
+    sys.modules["orjson"] = None  # makes "import orjson" raise ImportError
+
+import models  # noqa: E402
+from models import ConnectionRequest, ConnectionResponse  # noqa: E402
+
+BODY = json.dumps(
+    {
+        "userId": "user@example.com",
+        "targetIp": "10.0.0.4",
+        "username": "admin",
+        "password": "S3cr3t-P@ssw0rd",
+        "appstreamSessionContext": "x" * 512,
+    }
+).encode("utf-8")
+
+
+def baseline():
+    req_body = json.loads(BODY)
+    user_id = req_body.get("userId")
+    item = {
+        "id": str(uuid.uuid4()),
+        "userId": user_id,
+        "status": "PENDING",
+        "ttl": 60,
+        "targetIp": req_body.get("targetIp"),
+        "username": req_body.get("username"),
+        "password": req_body.get("password"),
+        "appstreamSessionContext": req_body.get("appstreamSessionContext"),
+    }
+    return json.dumps(
+        {
+            "targetIp": item.get("targetIp"),
+            "username": item.get("username"),
+            "password": item.get("password"),
+            "appstreamSessionContext": item.get("appstreamSessionContext"),
+        }
+    )
+
+
+def typed():
+    conn_req = ConnectionRequest.parse(BODY, str(len(BODY)))
+    return ConnectionResponse.from_item(conn_req.to_item()).to_json()
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    backend = "orjson" if models._orjson is not None else "stdlib json"
+    print(f"JSON backend: {backend}, iterations: {iterations}")
+    for name, fn in (("baseline", baseline), ("typed", typed)):
+        best = min(timeit.repeat(fn, number=iterations, repeat=5))
+        print(f"{name:>10}: {best / iterations * 1e6:.2f} us/op")
+
+
+if __name__ == "__main__":
+    main()
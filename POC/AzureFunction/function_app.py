@@ -1,11 +1,12 @@
 import azure.functions as func
-import json
 import logging
 import os
-import uuid
 
 from azure.cosmos import CosmosClient
 
+from indexing import MANAGE_CONTAINER_POLICY, RequestCharge, ensure_container_policy, log_request_charge
+from models import ConnectionRequest, ConnectionResponse, ValidationError, dumps
+
 app = func.FunctionApp(http_auth_level=func.AuthLevel.ANONYMOUS)
 
 # Cosmos DB configuration
@@ -15,10 +16,11 @@ DATABASE_NAME = os.environ.get("COSMOS_DATABASE")
 CONTAINER_NAME = os.environ.get("COSMOS_CONTAINER")
 
 _cosmos_client = None
+_policy_checked = False
 
 
 def get_container():
-    global _cosmos_client
+    global _cosmos_client, _policy_checked
 
     if not ENDPOINT or not KEY or not DATABASE_NAME or not CONTAINER_NAME:
         raise ValueError(
@@ -29,7 +31,18 @@ def get_container():
         _cosmos_client = CosmosClient(ENDPOINT, KEY)
 
     database = _cosmos_client.get_database_client(DATABASE_NAME)
-    return database.get_container_client(CONTAINER_NAME)
+    container = database.get_container_client(CONTAINER_NAME)
+
+    # Verify the indexing policy / TTL once per worker process. Best-effort:
+    # a failed check (throttling, read-only key) must not fail the launch.
+    if MANAGE_CONTAINER_POLICY and not _policy_checked:
+        _policy_checked = True
+        try:
+            ensure_container_policy(database, container)
+        except Exception as e:
+            logging.warning(f"Cosmos container policy check failed: {str(e)}")
+
+    return container
 
 
 @app.route(route="queue_connection", methods=["POST"])
@@ -37,31 +50,19 @@ def queue_connection(req: func.HttpRequest) -> func.HttpResponse:
     logging.info("Processing queue_connection request")
 
     try:
-        req_body = req.get_json()
-    except ValueError:
-        return func.HttpResponse("Invalid JSON", status_code=400)
+        conn_req = ConnectionRequest.parse(req.get_body(), req.headers.get("Content-Length"))
+    except ValidationError as e:
+        return func.HttpResponse(str(e), status_code=400)
 
-    user_id = req_body.get("userId")
-    if not user_id:
-        return func.HttpResponse("Missing 'userId'", status_code=400)
-
-    item = {
-        "id": str(uuid.uuid4()),
-        "userId": user_id,
-        "targetIp": req_body.get("targetIp"),
-        "username": req_body.get("username"),
-        "password": req_body.get("password"),
-        "appstreamSessionContext": req_body.get("appstreamSessionContext"),
-        "status": "PENDING",
-        # Short-lived TTL (seconds). Container must have TTL enabled.
-        "ttl": 60,
-    }
+    item = conn_req.to_item()
 
     try:
         container = get_container()
-        container.create_item(body=item)
+        create_charge = RequestCharge()
+        container.create_item(body=item, response_hook=create_charge)
+        log_request_charge("create", create_charge.total)
         return func.HttpResponse(
-            json.dumps({"message": "Request queued", "id": item["id"]}),
+            dumps({"message": "Request queued", "id": item["id"]}),
             mimetype="application/json",
             status_code=201,
         )
@@ -82,30 +83,32 @@ def fetch_connection(req: func.HttpRequest) -> func.HttpResponse:
         container = get_container()
         query = "SELECT * FROM c WHERE c.userId = @userId AND c.status = 'PENDING'"
         parameters = [{"name": "@userId", "value": user_id}]
+        query_charge = RequestCharge()
 
         items = list(
             container.query_items(
                 query=query,
                 parameters=parameters,
                 enable_cross_partition_query=False,
+                response_hook=query_charge,
             )
         )
+        log_request_charge("query", query_charge.total)
 
         if not items:
             return func.HttpResponse("No pending connection found", status_code=404)
 
         item = items[0]
-        container.delete_item(item=item["id"], partition_key=user_id)
+        # Serialize before deleting so a failure here never loses the only copy.
+        body = ConnectionResponse.from_item(item).to_json()
 
-        response_payload = {
-            "targetIp": item.get("targetIp"),
-            "username": item.get("username"),
-            "password": item.get("password"),
-            "appstreamSessionContext": item.get("appstreamSessionContext"),
-        }
+        delete_charge = RequestCharge()
+        container.delete_item(item=item["id"], partition_key=user_id, response_hook=delete_charge)
+        log_request_charge("delete", delete_charge.total)
+        log_request_charge("claim", query_charge.total + delete_charge.total)
 
         return func.HttpResponse(
-            json.dumps(response_payload),
+            body,
             mimetype="application/json",
             status_code=200,
         )
@@ -0,0 +1,118 @@
+import logging
+import os
+
+# Queue items are written once, claimed once and deleted, so the only paths
+# worth indexing are the ones the fetch_connection query filters on.
+# Everything else (credentials, session context, ...) is excluded to keep the
+# write RU charge down.
+CLAIM_INDEXING_POLICY = {
+    "indexingMode": "consistent",
+    "automatic": True,
+    "includedPaths": [
+        {"path": "/userId/?"},
+        {"path": "/status/?"},
+    ],
+    "excludedPaths": [
+        {"path": "/*"},
+        {"path": '/"_etag"/?'},
+    ],
+}
+
+PARTITION_KEY_PATH = "/userId"
+
+# Container TTL applied when TTL is found switched off. Items also carry their
+# own "ttl" (models.ITEM_TTL_SECONDS), which Cosmos only honours while the
+# container has TTL enabled (defaultTtl set, -1 included).
+DEFAULT_TTL_SECONDS = 60
+
+# replace_container is a full PUT: any container property not passed is reset.
+# These are carried over from the current definition (property -> keyword).
+_PRESERVED_PROPERTIES = {
+    "conflictResolutionPolicy": "conflict_resolution_policy",
+    "analyticalStorageTtl": "analytical_storage_ttl",
+    "computedProperties": "computed_properties",
+    "fullTextPolicy": "full_text_policy",
+    "vectorEmbeddingPolicy": "vector_embedding_policy",
+}
+
+MANAGE_CONTAINER_POLICY = os.environ.get("COSMOS_MANAGE_POLICY", "true").lower() in ("1", "true", "yes")
+
+
+def _paths(entries) -> set:
+    return {entry["path"] for entry in entries or []}
+
+
+def policy_matches(current: dict, expected: dict = CLAIM_INDEXING_POLICY) -> bool:
+    """Compare the parts of an indexing policy the broker cares about."""
+    current = current or {}
+    return (
+        current.get("indexingMode", "consistent").lower() == expected["indexingMode"]
+        and _paths(current.get("includedPaths")) == _paths(expected["includedPaths"])
+        and _paths(current.get("excludedPaths")) == _paths(expected["excludedPaths"])
+    )
+
+
+def ensure_container_policy(database, container) -> bool:
+    """Verify the container's indexing policy and TTL, replacing them if they drift.
+
+    Only indexingPolicy changes, plus defaultTtl when TTL is off; an existing
+    defaultTtl (including -1), the partition key and the other container
+    policies are sent back unchanged. Returns True when the container was
+    updated.
+    """
+    properties = container.read()
+    current_ttl = properties.get("defaultTtl")
+    if policy_matches(properties.get("indexingPolicy")) and current_ttl is not None:
+        return False
+
+    logging.warning(
+        "Cosmos container '%s' policy drifted (indexingPolicy=%s, defaultTtl=%s); replacing",
+        properties.get("id"),
+        properties.get("indexingPolicy"),
+        current_ttl,
+    )
+    preserved = {
+        keyword: properties[name]
+        for name, keyword in _PRESERVED_PROPERTIES.items()
+        if properties.get(name) is not None
+    }
+    # Reuse the container's own partition key definition (kind/version
+    # included): a changed definition makes Cosmos reject the replace.
+    database.replace_container(
+        container,
+        partition_key=properties["partitionKey"],
+        indexing_policy=CLAIM_INDEXING_POLICY,
+        default_ttl=DEFAULT_TTL_SECONDS if current_ttl is None else current_ttl,
+        **preserved,
+    )
+    return True
+
+
+class RequestCharge:
+    """response_hook that sums x-ms-request-charge over every response it sees.
+
+    Use one instance per operation so concurrent requests sharing the
+    CosmosClient never see each other's charges; query_items calls it once
+    per page.
+    """
+
+    __slots__ = ("total",)
+
+    def __init__(self):
+        self.total = 0.0
+
+    def __call__(self, headers, _result=None):
+        try:
+            self.total += float(headers.get("x-ms-request-charge", 0))
+        except (TypeError, ValueError):
+            pass
+
+
+def log_request_charge(operation: str, charge: float) -> float:
+    """Log an RU charge in a stable, queryable format.
+
+    Search Application Insights traces for "cosmos_ru" to chart cost per
+    launch over time.
+    """
+    logging.info("cosmos_ru operation=%s charge=%.2f", operation, charge)
+    return charge
@@ -0,0 +1,191 @@
+import json
+import os
+import uuid
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional speedup
+    _orjson = None
+
+
+# Requests larger than this are rejected before any JSON parsing happens.
+MAX_BODY_BYTES = int(os.environ.get("BROKER_MAX_BODY_BYTES", "16384"))
+
+# Per-field caps (characters). The session context is an opaque blob from the
+# portal, so it gets more room than the short credential fields.
+FIELD_LIMITS = {
+    "userId": 256,
+    "targetIp": 256,
+    "username": 256,
+    "password": 1024,
+    "appstreamSessionContext": 8192,
+}
+
+# Requests are a flat object of strings; anything nested deeper than this is
+# rejected. Enforced for both backends (orjson has no depth limit of its own;
+# the stdlib parser hits RecursionError at roughly 1000 levels).
+MAX_JSON_DEPTH = 32
+
+ITEM_TTL_SECONDS = 60
+
+
+class ValidationError(ValueError):
+    """Raised when a request body is oversized, malformed or fails the schema.
+
+    The message is safe to return to the caller as a 400 response body.
+    """
+
+
+if _orjson is not None:
+
+    def loads(data):
+        return _orjson.loads(data)
+
+    def dumps(obj) -> bytes:
+        return _orjson.dumps(obj)
+
+    JSONDecodeError = _orjson.JSONDecodeError
+
+else:
+    _encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def _reject_constant(name):
+        # Match orjson, which rejects NaN/Infinity/-Infinity.
+        raise ValueError(f"Invalid JSON constant {name}")
+
+    def loads(data):
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data).decode("utf-8")
+        return json.loads(data, parse_constant=_reject_constant)
+
+    def dumps(obj) -> bytes:
+        return _encoder.encode(obj).encode("utf-8")
+
+    JSONDecodeError = ValueError
+
+
+def check_size(body, content_length=None) -> None:
+    """Reject payloads over MAX_BODY_BYTES using the header when available."""
+    if content_length:
+        try:
+            declared = int(content_length)
+        except ValueError:
+            raise ValidationError("Invalid Content-Length header")
+        if declared > MAX_BODY_BYTES:
+            raise ValidationError(f"Request body exceeds {MAX_BODY_BYTES} bytes")
+    if body is not None and len(body) > MAX_BODY_BYTES:
+        raise ValidationError(f"Request body exceeds {MAX_BODY_BYTES} bytes")
+
+
+def _too_deep(data: dict) -> bool:
+    """Iteratively check nesting depth so deep input cannot recurse."""
+    stack = [(value, 2) for value in data.values() if isinstance(value, (dict, list))]
+    while stack:
+        value, depth = stack.pop()
+        if depth > MAX_JSON_DEPTH:
+            return True
+        children = value.values() if isinstance(value, dict) else value
+        stack.extend((child, depth + 1) for child in children if isinstance(child, (dict, list)))
+    return False
+
+
+def _optional_str(body: dict, name: str):
+    value = body.get(name)
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise ValidationError(f"Field '{name}' must be a string")
+    if len(value) > FIELD_LIMITS[name]:
+        raise ValidationError(f"Field '{name}' exceeds {FIELD_LIMITS[name]} characters")
+    try:
+        # Lone surrogates (a JSON "\ud800" escape) decode but cannot be written back out.
+        value.encode("utf-8")
+    except UnicodeEncodeError:
+        raise ValidationError(f"Field '{name}' is not valid UTF-8")
+    return value
+
+
+class ConnectionRequest:
+    """Validated body of a queue_connection POST."""
+
+    __slots__ = ("user_id", "target_ip", "username", "password", "appstream_session_context")
+
+    def __init__(self, user_id, target_ip=None, username=None, password=None, appstream_session_context=None):
+        self.user_id = user_id
+        self.target_ip = target_ip
+        self.username = username
+        self.password = password
+        self.appstream_session_context = appstream_session_context
+
+    @classmethod
+    def parse(cls, body, content_length=None) -> "ConnectionRequest":
+        """Size-check, decode and validate a raw request body in one pass."""
+        check_size(body, content_length)
+        if not body:
+            raise ValidationError("Invalid JSON")
+        try:
+            data = loads(body)
+        except (JSONDecodeError, UnicodeDecodeError, RecursionError):
+            # RecursionError: deeply nested input on the stdlib fallback.
+            raise ValidationError("Invalid JSON")
+        if not isinstance(data, dict):
+            raise ValidationError("Request body must be a JSON object")
+        if _too_deep(data):
+            raise ValidationError("Invalid JSON")
+
+        user_id = _optional_str(data, "userId")
+        if not user_id:
+            raise ValidationError("Missing 'userId'")
+
+        return cls(
+            user_id,
+            _optional_str(data, "targetIp"),
+            _optional_str(data, "username"),
+            _optional_str(data, "password"),
+            _optional_str(data, "appstreamSessionContext"),
+        )
+
+    def to_item(self) -> dict:
+        """Build the Cosmos DB queue document for this request."""
+        return {
+            "id": str(uuid.uuid4()),
+            "userId": self.user_id,
+            "targetIp": self.target_ip,
+            "username": self.username,
+            "password": self.password,
+            "appstreamSessionContext": self.appstream_session_context,
+            "status": "PENDING",
+            # Short-lived TTL (seconds). Container must have TTL enabled.
+            "ttl": ITEM_TTL_SECONDS,
+        }
+
+
+class ConnectionResponse:
+    """Payload returned to the launcher by fetch_connection."""
+
+    __slots__ = ("target_ip", "username", "password", "appstream_session_context")
+
+    def __init__(self, target_ip=None, username=None, password=None, appstream_session_context=None):
+        self.target_ip = target_ip
+        self.username = username
+        self.password = password
+        self.appstream_session_context = appstream_session_context
+
+    @classmethod
+    def from_item(cls, item: dict) -> "ConnectionResponse":
+        return cls(
+            item.get("targetIp"),
+            item.get("username"),
+            item.get("password"),
+            item.get("appstreamSessionContext"),
+        )
+
+    def to_json(self) -> bytes:
+        return dumps(
+            {
+                "targetIp": self.target_ip,
+                "username": self.username,
+                "password": self.password,
+                "appstreamSessionContext": self.appstream_session_context,
+            }
+        )
@@ -0,0 +1,79 @@
+"""Tests for the container policy check and RU accounting in indexing.py."""
+
+import copy
+
+import pytest
+
+import indexing
+
+DRIFTED = {
+    "id": "ConnectionRequests",
+    "partitionKey": {"paths": ["/userId"], "kind": "Hash"},
+    "indexingPolicy": {
+        "indexingMode": "consistent",
+        "automatic": True,
+        "includedPaths": [{"path": "/*"}],
+        "excludedPaths": [{"path": '/"_etag"/?'}],
+    },
+    "defaultTtl": -1,
+    "conflictResolutionPolicy": {"mode": "LastWriterWins", "conflictResolutionPath": "/_ts"},
+    "computedProperties": [{"name": "cp_lower", "query": "SELECT VALUE LOWER(c.userId) FROM c"}],
+}
+
+
+class FakeContainer:
+    def __init__(self, properties):
+        self.properties = properties
+
+    def read(self):
+        return copy.deepcopy(self.properties)
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.calls = []
+
+    def replace_container(self, container, **kwargs):
+        self.calls.append((container, kwargs))
+
+
+def test_matching_container_is_left_alone():
+    properties = dict(DRIFTED, indexingPolicy=indexing.CLAIM_INDEXING_POLICY)
+    database = FakeDatabase()
+    assert indexing.ensure_container_policy(database, FakeContainer(properties)) is False
+    assert database.calls == []
+
+
+def test_drift_replaces_only_indexing_policy():
+    container = FakeContainer(DRIFTED)
+    database = FakeDatabase()
+    assert indexing.ensure_container_policy(database, container) is True
+
+    [(target, kwargs)] = database.calls
+    assert target is container
+    assert kwargs == {
+        # Partition key definition is sent back as read (version 1 here).
+        "partition_key": DRIFTED["partitionKey"],
+        "indexing_policy": indexing.CLAIM_INDEXING_POLICY,
+        "default_ttl": -1,
+        "conflict_resolution_policy": DRIFTED["conflictResolutionPolicy"],
+        "computed_properties": DRIFTED["computedProperties"],
+    }
+
+
+@pytest.mark.parametrize("indexing_policy", [DRIFTED["indexingPolicy"], indexing.CLAIM_INDEXING_POLICY])
+def test_ttl_switched_on_when_off(indexing_policy):
+    properties = dict(DRIFTED, indexingPolicy=indexing_policy)
+    del properties["defaultTtl"]
+    database = FakeDatabase()
+    assert indexing.ensure_container_policy(database, FakeContainer(properties)) is True
+    assert database.calls[0][1]["default_ttl"] == indexing.DEFAULT_TTL_SECONDS
+
+
+def test_request_charge_sums_every_response():
+    charge = indexing.RequestCharge()
+    charge({"x-ms-request-charge": "2.5"}, [])
+    charge({"x-ms-request-charge": "2.75"}, [{"id": "1"}])
+    charge({}, None)
+    charge({"x-ms-request-charge": "n/a"}, None)
+    assert charge.total == pytest.approx(5.25)
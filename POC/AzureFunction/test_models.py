@@ -0,0 +1,124 @@
+"""Validation tests for the broker request models.
+
+Run from POC/AzureFunction with ``python -m pytest``. Every test runs against
+both JSON backends: orjson (skipped when not installed) and the stdlib fallback.
+"""
+
+import importlib
+import json
+import sys
+
+import pytest
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def models(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.delitem(sys.modules, "models", raising=False)
+    module = importlib.import_module("models")
+    assert (module._orjson is not None) == (request.param == "orjson")
+    return module
+
+
+def body(**fields) -> bytes:
+    return json.dumps(fields).encode("utf-8")
+
+
+def assert_rejected(models, raw, message, content_length=None):
+    with pytest.raises(models.ValidationError) as excinfo:
+        models.ConnectionRequest.parse(raw, content_length)
+    assert message in str(excinfo.value)
+
+
+def test_valid_request_round_trips(models):
+    raw = body(userId="u@example.com", targetIp="10.0.0.4", password="pé")
+    conn_req = models.ConnectionRequest.parse(raw, str(len(raw)))
+    item = conn_req.to_item()
+    assert item["userId"] == "u@example.com"
+    assert item["status"] == "PENDING"
+    assert item["ttl"] == models.ITEM_TTL_SECONDS
+
+    payload = json.loads(models.ConnectionResponse.from_item(item).to_json())
+    assert payload == {
+        "targetIp": "10.0.0.4",
+        "username": None,
+        "password": "pé",
+        "appstreamSessionContext": None,
+    }
+
+
+def test_oversized_content_length(models):
+    assert_rejected(models, body(userId="u"), "exceeds", str(models.MAX_BODY_BYTES + 1))
+
+
+def test_oversized_body(models):
+    raw = body(userId="u", appstreamSessionContext="x" * models.MAX_BODY_BYTES)
+    assert_rejected(models, raw, "exceeds")
+
+
+def test_non_numeric_content_length(models):
+    assert_rejected(models, body(userId="u"), "Invalid Content-Length", "abc")
+
+
+@pytest.mark.parametrize("raw", [b"", b"{bad", b"\xff\xfe"])
+def test_malformed_json(models, raw):
+    assert_rejected(models, raw, "Invalid JSON")
+
+
+@pytest.mark.parametrize("raw", [b"[1]", b'"u"', b"null"])
+def test_non_object_json(models, raw):
+    assert_rejected(models, raw, "must be a JSON object")
+
+
+@pytest.mark.parametrize("raw", [body(), body(userId=""), body(userId=None)])
+def test_missing_user_id(models, raw):
+    assert_rejected(models, raw, "Missing 'userId'")
+
+
+@pytest.mark.parametrize("value", [5, ["u"], {"u": 1}, True])
+def test_non_string_user_id(models, value):
+    assert_rejected(models, body(userId=value), "Field 'userId' must be a string")
+
+
+@pytest.mark.parametrize("field", ["userId", "targetIp", "username", "password", "appstreamSessionContext"])
+def test_field_length_caps(models, field):
+    limit = models.FIELD_LIMITS[field]
+    fields = {"userId": "u", field: "x" * limit}
+    assert models.ConnectionRequest.parse(body(**fields)) is not None
+
+    fields[field] = "x" * (limit + 1)
+    assert_rejected(models, body(**fields), f"Field '{field}' exceeds")
+
+
+def nested(depth: int) -> bytes:
+    return b'{"userId":"u","x":' + b"[" * (depth - 1) + b"]" * (depth - 1) + b"}"
+
+
+@pytest.mark.parametrize("raw", [b"[" * 5000, nested(3000)])
+def test_deep_nesting(models, raw):
+    assert_rejected(models, raw, "Invalid JSON")
+
+
+def test_nesting_depth_cap(models):
+    assert models.ConnectionRequest.parse(nested(models.MAX_JSON_DEPTH)) is not None
+    assert_rejected(models, nested(models.MAX_JSON_DEPTH + 1), "Invalid JSON")
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        b'{"userId":"u","password":"\\ud800"}',
+        b'{"userId":"\\udfff"}',
+    ],
+)
+def test_lone_surrogate(models, raw):
+    with pytest.raises(models.ValidationError):
+        models.ConnectionRequest.parse(raw)
+
+
+@pytest.mark.parametrize("constant", [b"NaN", b"Infinity", b"-Infinity"])
+def test_non_finite_constants(models, constant):
+    assert_rejected(models, b'{"userId":"u","extra":' + constant + b"}", "Invalid JSON")
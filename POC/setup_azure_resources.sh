@@ -30,9 +30,12 @@ az cosmosdb create --name $COSMOS_ACCOUNT --resource-group $RESOURCE_GROUP --kin
 echo "Creating Cosmos DB Database..."
 az cosmosdb sql database create --account-name $COSMOS_ACCOUNT --resource-group $RESOURCE_GROUP --name $DATABASE_NAME
 
-# 4. Create Cosmos DB Container with TTL and Partition Key
+# 4. Create Cosmos DB Container with TTL, Partition Key and a minimal indexing policy
+# Only the fields the claim query filters on are indexed (mirrors CLAIM_INDEXING_POLICY
+# in AzureFunction/indexing.py; the broker re-checks it on the first request each worker handles).
 echo "Creating Cosmos DB Container..."
-az cosmosdb sql container create --account-name $COSMOS_ACCOUNT --resource-group $RESOURCE_GROUP --database-name $DATABASE_NAME --name $CONTAINER_NAME --partition-key-path "/userId" --ttl 60
+INDEX_POLICY='{"indexingMode":"consistent","automatic":true,"includedPaths":[{"path":"/userId/?"},{"path":"/status/?"}],"excludedPaths":[{"path":"/*"},{"path":"/\"_etag\"/?"}]}'
+az cosmosdb sql container create --account-name $COSMOS_ACCOUNT --resource-group $RESOURCE_GROUP --database-name $DATABASE_NAME --name $CONTAINER_NAME --partition-key-path "/userId" --ttl 60 --idx "$INDEX_POLICY"
 
 # 5. Create Storage Account (Required for Function App)
 echo "Creating Storage Account..."